@@ -1,25 +1,26 @@
-import os
+import queue
 import logging
-from dotenv import load_dotenv
-from linkedin_menu import LinkedInAPI
+import threading
+import config
+from linkedin_api import LinkedInAPI
 from linkedin_article_generator import ArticleGenerator
+from logging_setup import configure_logging
 
 # Configure logging
-logging.basicConfig(
-    level=os.getenv('LOG_LEVEL', 'INFO'),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    filename=os.getenv('LOG_FILE', 'automatic_poster.log')
+configure_logging(
+    level=config.LOG_LEVEL,
+    filename=config.LOG_FILE or 'automatic_poster.log'
 )
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
+# Marks the end of a pipeline queue
+_DONE = object()
 
 class AutomaticPoster:
     """Handles single post generation and posting."""
     def __init__(self):
-        self.linkedin_client = LinkedInAPI(os.getenv('LINKEDIN_ACCESS_TOKEN'))
-        self.article_generator = ArticleGenerator(os.getenv('GOOGLE_API_KEY'))
+        self.linkedin_client = LinkedInAPI(config.LINKEDIN_ACCESS_TOKEN)
+        self.article_generator = ArticleGenerator(config.GOOGLE_API_KEY, enable_cache=config.LLM_MEMOIZE)
 
     def generate_and_post(self):
         """Generate and post a single piece of content."""
@@ -44,9 +45,62 @@ class AutomaticPoster:
             logger.error(f"Error in posting: {str(e)}")
             print(f"\nError creating post: {str(e)}")
 
+    def generate_and_post_many(self, n):
+        """Generate and post n pieces of content as a topic -> article -> post pipeline.
+
+        Each stage runs in its own thread, so Gemini and LinkedIn calls for
+        different posts overlap instead of running strictly one after another.
+        """
+        jobs, topics, articles = queue.Queue(), queue.Queue(), queue.Queue()
+        for i in range(n):
+            jobs.put(i)
+        jobs.put(_DONE)
+
+        stages = [
+            threading.Thread(
+                target=self._run_stage,
+                args=("topic", lambda _: self.article_generator.generate_viral_topic(), jobs, topics),
+                daemon=True
+            ),
+            threading.Thread(
+                target=self._run_stage,
+                args=("article", self.article_generator.generate_article, topics, articles),
+                daemon=True
+            ),
+        ]
+        for stage in stages:
+            stage.start()
+
+        posted = self._run_stage("post", self._post_article, articles, queue.Queue())
+        logger.info(f"Posted {posted} of {n} articles")
+
+    def _run_stage(self, name, func, source, sink):
+        """Apply func to each item from source, pass results on to sink and return the success count."""
+        done = 0
+        for item in iter(source.get, _DONE):
+            try:
+                sink.put(func(item))
+                done += 1
+            except Exception as e:
+                logger.error(f"Error in {name} stage: {str(e)}")
+                print(f"\nError in {name} stage: {str(e)}")
+        sink.put(_DONE)
+        return done
+
+    def _post_article(self, article):
+        """Post a generated article to LinkedIn."""
+        response = self.linkedin_client.submit_share(text=article)
+        logger.info(f"Post created successfully! Post ID: {response['updateKey']}")
+        print(f"\nPost created successfully! Post ID: {response['updateKey']}")
+        return response
+
 def main():
     poster = AutomaticPoster()
-    poster.generate_and_post()
+    post_count = config.POST_COUNT
+    if post_count > 1:
+        poster.generate_and_post_many(post_count)
+    else:
+        poster.generate_and_post()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
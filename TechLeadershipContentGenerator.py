@@ -1,26 +1,20 @@
 import os
+import re
 import json
-import time
 import random
 import logging
-import requests
+import functools
+import itertools
 from datetime import datetime
-from dotenv import load_dotenv
-from linkedin_menu import LinkedInAPI
-
-# Configure logging
-logging.basicConfig(
-    level=os.getenv('LOG_LEVEL', 'INFO'),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    filename=os.getenv('LOG_FILE', 'tech_leadership_content.log')
-)
-logger = logging.getLogger(__name__)
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from llm_cache import LLMCache, DEFAULT_TTL
+from logging_setup import configure_logging
 
-# Load environment variables
-load_dotenv()
+logger = logging.getLogger(__name__)
 
 # Hook styles
-HOOK_STYLES = [
+HOOK_STYLES = (
     "Your team is struggling, and your {topic} approach might be the reason why.",
     "You're working hard on {topic}, but it's not working like you hoped.",
     "Your team keeps hitting the same wall with {topic}, and it's getting frustrating.",
@@ -29,66 +23,66 @@ HOOK_STYLES = [
     "Your team deserves better than the current {topic} situation.",
     "The way you're handling {topic} might be holding your team back.",
     "You're smart, but {topic} is trickier than it looks."
-]
+)
 
 # Major tech hubs in US, Canada, and London with their specific characteristics
-LOCATIONS = {
+LOCATIONS = MappingProxyType({
     # US Cities
     "Silicon Valley": {
-        "topics": ["Startup Culture", "Venture Capital", "Tech Innovation", "Scale-up Strategies", 
-                  "AI Development", "Tech Ecosystem", "Startup Funding", "Tech Talent Pool"],
-        "hashtags": ["#SiliconValley", "#SVStartups", "#BayAreaTech", "#TechSV", "#StartupSV"]
+        "topics": ("Startup Culture", "Venture Capital", "Tech Innovation", "Scale-up Strategies", 
+                  "AI Development", "Tech Ecosystem", "Startup Funding", "Tech Talent Pool"),
+        "hashtags": ("#SiliconValley", "#SVStartups", "#BayAreaTech", "#TechSV", "#StartupSV")
     },
     "New York": {
-        "topics": ["FinTech", "Corporate Innovation", "Tech in Finance", "Urban Tech Solutions",
-                  "Media Tech", "E-commerce", "Tech in Wall Street", "Startup Scene"],
-        "hashtags": ["#NYCTech", "#FinTechNYC", "#NYCStartups", "#TechNY", "#NYCInnovation"]
+        "topics": ("FinTech", "Corporate Innovation", "Tech in Finance", "Urban Tech Solutions",
+                  "Media Tech", "E-commerce", "Tech in Wall Street", "Startup Scene"),
+        "hashtags": ("#NYCTech", "#FinTechNYC", "#NYCStartups", "#TechNY", "#NYCInnovation")
     },
     "Boston": {
-        "topics": ["Biotech", "Healthcare Tech", "Education Tech", "Research & Development",
-                  "Life Sciences", "Academic Innovation", "Tech in Healthcare"],
-        "hashtags": ["#BostonTech", "#BioTech", "#EdTech", "#BostonStartups", "#TechBoston"]
+        "topics": ("Biotech", "Healthcare Tech", "Education Tech", "Research & Development",
+                  "Life Sciences", "Academic Innovation", "Tech in Healthcare"),
+        "hashtags": ("#BostonTech", "#BioTech", "#EdTech", "#BostonStartups", "#TechBoston")
     },
     "Austin": {
-        "topics": ["Tech Migration", "Startup Growth", "Tech Events", "Innovation Culture",
-                  "Tech Talent Attraction", "Business Relocation", "Tech Community"],
-        "hashtags": ["#AustinTech", "#ATXTech", "#TexasTech", "#AustinStartups", "#TechAustin"]
+        "topics": ("Tech Migration", "Startup Growth", "Tech Events", "Innovation Culture",
+                  "Tech Talent Attraction", "Business Relocation", "Tech Community"),
+        "hashtags": ("#AustinTech", "#ATXTech", "#TexasTech", "#AustinStartups", "#TechAustin")
     },
     "Seattle": {
-        "topics": ["Cloud Computing", "E-commerce", "Tech Giants", "Software Development",
-                  "AI Research", "Tech Infrastructure", "Cloud Services"],
-        "hashtags": ["#SeattleTech", "#CloudTech", "#TechSeattle", "#PNWTech", "#SeattleStartups"]
+        "topics": ("Cloud Computing", "E-commerce", "Tech Giants", "Software Development",
+                  "AI Research", "Tech Infrastructure", "Cloud Services"),
+        "hashtags": ("#SeattleTech", "#CloudTech", "#TechSeattle", "#PNWTech", "#SeattleStartups")
     },
     
     # Canadian Cities
     "Toronto": {
-        "topics": ["Canadian Tech Hub", "FinTech Innovation", "AI Development", "Tech Talent",
-                  "Startup Ecosystem", "Tech Investment", "Diversity in Tech"],
-        "hashtags": ["#TorontoTech", "#CanadianTech", "#TechTO", "#TorontoStartups", "#TechCanada"]
+        "topics": ("Canadian Tech Hub", "FinTech Innovation", "AI Development", "Tech Talent",
+                  "Startup Ecosystem", "Tech Investment", "Diversity in Tech"),
+        "hashtags": ("#TorontoTech", "#CanadianTech", "#TechTO", "#TorontoStartups", "#TechCanada")
     },
     "Vancouver": {
-        "topics": ["Tech in Gaming", "Sustainable Tech", "Clean Tech", "Tech Innovation",
-                  "Startup Scene", "Tech Talent", "Pacific Tech Hub"],
-        "hashtags": ["#VancouverTech", "#VanTech", "#TechVan", "#VancouverStartups", "#PacificTech"]
+        "topics": ("Tech in Gaming", "Sustainable Tech", "Clean Tech", "Tech Innovation",
+                  "Startup Scene", "Tech Talent", "Pacific Tech Hub"),
+        "hashtags": ("#VancouverTech", "#VanTech", "#TechVan", "#VancouverStartups", "#PacificTech")
     },
     "Montreal": {
-        "topics": ["AI Research", "Gaming Industry", "Tech Innovation", "Bilingual Tech Talent",
-                  "Startup Culture", "Tech Education", "Creative Tech"],
-        "hashtags": ["#MontrealTech", "#MTLTech", "#TechMTL", "#MontrealStartups", "#QuebecTech"]
+        "topics": ("AI Research", "Gaming Industry", "Tech Innovation", "Bilingual Tech Talent",
+                  "Startup Culture", "Tech Education", "Creative Tech"),
+        "hashtags": ("#MontrealTech", "#MTLTech", "#TechMTL", "#MontrealStartups", "#QuebecTech")
     },
     
     # London
     "London": {
-        "topics": ["FinTech Innovation", "European Tech Market", "Tech Regulation", "International Expansion",
+        "topics": ("FinTech Innovation", "European Tech Market", "Tech Regulation", "International Expansion",
                   "Tech Investment", "Startup Scene", "Tech Talent", "Digital Transformation",
-                  "Tech in Finance", "Innovation Culture", "Tech Policy", "Global Tech Hub"],
-        "hashtags": ["#LondonTech", "#UKTech", "#TechUK", "#LondonStartups", "#TechLondon",
-                    "#FinTechLondon", "#TechInnovation", "#DigitalLondon"]
+                  "Tech in Finance", "Innovation Culture", "Tech Policy", "Global Tech Hub"),
+        "hashtags": ("#LondonTech", "#UKTech", "#TechUK", "#LondonStartups", "#TechLondon",
+                    "#FinTechLondon", "#TechInnovation", "#DigitalLondon")
     }
-}
+})
 
 # General topics that resonate with tech leaders, managers, and HR
-GENERAL_TOPICS = [
+GENERAL_TOPICS = (
     "Leadership in Tech",
     "Team Management",
     "HR Innovation",
@@ -104,10 +98,10 @@ GENERAL_TOPICS = [
     "Future of Work",
     "Tech Recruitment",
     "Performance Management"
-]
+)
 
 # Content types with specific angles for tech leadership
-CONTENT_TYPES = [
+CONTENT_TYPES = (
     "Insightful analysis on {topic} in {location}",
     "Practical tips for {topic} in the {location} tech scene",
     "Future trends in {topic} specific to {location}",
@@ -116,101 +110,130 @@ CONTENT_TYPES = [
     "Data-driven insights on {topic} in the {location} market",
     "Best practices for {topic} in {location}'s tech ecosystem",
     "Innovative approaches to {topic} from {location}"
-]
+)
 
 # General hashtags relevant to the target audience
-GENERAL_HASHTAGS = [
+GENERAL_HASHTAGS = (
     "#TechLeadership", "#HRTech", "#DigitalTransformation", "#FutureOfWork",
     "#LeadershipDevelopment", "#TalentManagement", "#Innovation", "#TechIndustry",
     "#WorkplaceCulture", "#EmployeeEngagement", "#DiversityInTech", "#TechRecruitment",
     "#ManagementTips", "#HRInnovation", "#TechTrends"
-]
+)
 
 # Emoji sets for different content sections
-EMOJIS = {
-    "opening": ["🚀", "💡", "🎯", "🌟", "📈", "💼", "🎓", "🔍"],
-    "key_points": ["👉", "💡", "🔑", "📌", "✨", "🎯", "💪", "📊"],
-    "conclusion": ["💭", "🤔", "💫", "🎉", "🚀", "💡", "🌟", "📝"],
-    "call_to_action": ["💬", "🤝", "👥", "💡", "🎯", "🚀", "💫", "🌟"]
+EMOJIS = MappingProxyType({
+    "opening": ("🚀", "💡", "🎯", "🌟", "📈", "💼", "🎓", "🔍"),
+    "key_points": ("👉", "💡", "🔑", "📌", "✨", "🎯", "💪", "📊"),
+    "conclusion": ("💭", "🤔", "💫", "🎉", "🚀", "💡", "🌟", "📝"),
+    "call_to_action": ("💬", "🤝", "👥", "💡", "🎯", "🚀", "💫", "🌟")
+})
+
+# Dedicated RNG so batch generation doesn't share the global random state
+_rng = random.Random()
+
+# Flat (location, topic, content type index) choice space, built once at import
+_CHOICES = tuple(
+    (location, topic, template_id)
+    for location, data in LOCATIONS.items()
+    for topic in data["topics"] + GENERAL_TOPICS
+    for template_id in range(len(CONTENT_TYPES))
+)
+
+# Location names in a fixed order, plus cumulative weights over _CHOICES that
+# give every location the same total weight however many topics it has
+_LOCATION_NAMES = tuple(LOCATIONS)
+_LOCATION_SIZES = {
+    location: sum(1 for choice in _CHOICES if choice[0] == location)
+    for location in _LOCATION_NAMES
 }
+_CHOICE_CUM_WEIGHTS = tuple(itertools.accumulate(
+    1 / _LOCATION_SIZES[location] for location, _, _ in _CHOICES
+))
 
-class TechLeadershipContentGenerator:
-    """Generates tech leadership content using Gemini API and posts to LinkedIn."""
-    def __init__(self):
-        self.api_key = os.getenv('GOOGLE_API_KEY')
-        self.api_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
-        self.linkedin_client = LinkedInAPI(os.getenv('LINKEDIN_ACCESS_TOKEN'))
-
-    def _make_request(self, prompt):
-        """Make a request to Gemini API."""
-        headers = {
-            'Content-Type': 'application/json'
-        }
-        data = {
-            "contents": [{
-                "parts": [{"text": prompt}]
-            }]
-        }
-        try:
-            response = requests.post(
-                f"{self.api_url}?key={self.api_key}",
-                headers=headers,
-                json=data
-            )
-            if response.status_code != 200:
-                raise Exception(f"API request failed: {response.text}")
-            return response.json()
-        except Exception as e:
-            logger.error(f"Request failed: {str(e)}")
-            raise
+def _draw_choices(k):
+    """Draw k (location, topic, template_id) choices with locations equally likely."""
+    return _rng.choices(_CHOICES, cum_weights=_CHOICE_CUM_WEIGHTS, k=k)
 
-    def generate_and_post(self):
-        """Generate content and post to LinkedIn."""
-        try:
-            # Generate content
-            content = self.generate_content()
-            logger.info("Content generated successfully")
-            print("\nGenerated content:")
-            print("=" * 50)
-            print(content)
-            print("=" * 50)
+# Location-specific plus general hashtags for each location
+_HASHTAG_POOLS = {
+    location: data["hashtags"] + GENERAL_HASHTAGS
+    for location, data in LOCATIONS.items()
+}
 
-            # Post to LinkedIn
-            response = self.linkedin_client.submit_share(text=content)
-            logger.info(f"Post created successfully! Post ID: {response['updateKey']}")
-            print(f"\nPost created successfully! Post ID: {response['updateKey']}")
+# Pre-joined hashtag lines of 5-7 tags, sampled once at import for each location
+_HASHTAG_LINES = {
+    location: tuple(
+        " ".join(_rng.sample(pool, _rng.randint(5, 7)))
+        for _ in range(256)
+    )
+    for location, pool in _HASHTAG_POOLS.items()
+}
 
-            # Save to file with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"tech_leadership_content_{timestamp}.txt"
-            
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write(content)
-                
-            print(f"\nContent saved to {filename}")
+# Markdown characters stripped from generated text
+_STRIP = str.maketrans("", "", "*_`")
 
-        except Exception as e:
-            logger.error(f"Error in generate_and_post: {str(e)}")
-            print(f"\nError: {str(e)}")
+# Hook style labels the model sometimes echoes at the start of a post
+_PREFIX_LABELS = ('Story:', 'Curious:', 'Bold:', 'Relatable:', 'Contrarian:', 'Metric:', 'Question:', 'Revelation:')
 
-    def generate_content(self):
-        """Generate tech leadership content."""
-        # Select a random location and its specific topics
-        location = random.choice(list(LOCATIONS.keys()))
-        location_data = LOCATIONS[location]
-        
-        # Combine location-specific and general topics
-        all_topics = location_data["topics"] + GENERAL_TOPICS
-        topic = random.choice(all_topics)
-        
-        # Select content type and format with location
-        content_type = random.choice(CONTENT_TYPES).format(topic=topic, location=location)
-        
-        # Select a random hook style
-        hook_style = random.choice(HOOK_STYLES).format(topic=topic)
-        
-        # Generate the prompt
-        prompt = f"""Create a unique LinkedIn post for tech leaders, managers, and HR professionals about {content_type}.
+# One regex per emoji section to check whether a line already has one
+_EMOJI_RES = {
+    section: re.compile('|'.join(map(re.escape, emojis)))
+    for section, emojis in EMOJIS.items()
+}
+
+# Placeholder stored in template-cached responses in place of the city name
+LOCATION_PLACEHOLDER = "{location}"
+
+def _decorate(content, location):
+    """Clean up generated text, add emojis and append hashtags.
+
+    Pure string processing with no instance state, kept at module level so the
+    post-processing can be reused and profiled on its own.
+    """
+    # Remove markdown characters (asterisks, underscores, backticks) from the content
+    content = content.translate(_STRIP)
+    
+    # Remove prefix labels like "Story:", "Curious:", etc.
+    content_lines = content.split('\n')
+    if content_lines[0].startswith(_PREFIX_LABELS):
+        content_lines[0] = content_lines[0].split(':', 1)[1].strip()
+    
+    # Draw every emoji the post might need up front, one per key point line
+    opening, conclusion, call_to_action = (
+        _rng.choice(EMOJIS[section]) for section in ("opening", "conclusion", "call_to_action")
+    )
+    key_point_emojis = _rng.choices(EMOJIS["key_points"], k=len(content_lines))
+    
+    # Add emojis if they're not already present
+    if not _EMOJI_RES["opening"].search(content_lines[0]):
+        content_lines[0] = f"{opening} {content_lines[0]}"
+    
+    # Add emojis to key points
+    key_points = _EMOJI_RES["key_points"]
+    for i, line in enumerate(content_lines[1:], 1):
+        if line.strip() and not key_points.search(line):
+            content_lines[i] = f"{key_point_emojis[i]} {line}"
+    
+    # Add emoji to conclusion if not present
+    if not _EMOJI_RES["conclusion"].search(content_lines[-2]):
+        content_lines[-2] = f"{conclusion} {content_lines[-2]}"
+    
+    # Add emoji to call to action if not present
+    if not _EMOJI_RES["call_to_action"].search(content_lines[-1]):
+        content_lines[-1] = f"{call_to_action} {content_lines[-1]}"
+    
+    content = '\n'.join(content_lines)
+    
+    # Pick one of the pre-joined location-specific and general hashtag lines
+    hashtags = _rng.choice(_HASHTAG_LINES[location])
+    
+    # Format the final post
+    post = f"{content}\n\n{hashtags}"
+    
+    return post
+
+# Post prompt; only content_type, hook_style and location change per call
+_PROMPT_TEMPLATE = """Create a unique LinkedIn post for tech leaders, managers, and HR professionals about {content_type}.
 
         Write this like you're having a real conversation with a fellow leader. Be authentic and original.
 
@@ -262,53 +285,285 @@ class TechLeadershipContentGenerator:
         - Make each post feel unique
 
         Return only the formatted post text."""
+
+# Single background thread that appends to the post archive, so saving never
+# blocks posting; pending writes are finished before the interpreter exits
+_archive_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archive")
+
+def _append_lines(filename, lines):
+    """Append pre-serialized lines to a file in one buffered write."""
+    with open(filename, "a", encoding="utf-8", buffering=1 << 16) as f:
+        f.writelines(lines)
+
+def _log_write_error(future):
+    """Log a failed archive write, which would otherwise be dropped silently."""
+    if future.exception() is not None:
+        logger.error(f"Error saving content: {str(future.exception())}")
+
+class TechLeadershipContentGenerator:
+    """Generates tech leadership content using Gemini API and posts to LinkedIn."""
+    def __init__(self, enable_cache=False):
+        # Clients are created on first use, so importing or constructing the
+        # generator doesn't open the cache database or read credentials
+        self.enable_cache = enable_cache
+
+    @functools.cached_property
+    def linkedin_client(self):
+        """LinkedIn client, created on first post."""
+        from linkedin_api import LinkedInAPI
+        return LinkedInAPI(os.getenv('LINKEDIN_ACCESS_TOKEN'))
+
+    @functools.cached_property
+    def cache(self):
+        """Persistent Gemini response cache, opened on first use."""
+        return LLMCache(
+            os.getenv('LLM_CACHE_FILE', 'cache.db'),
+            ttl=int(os.getenv('LLM_CACHE_TTL', DEFAULT_TTL))
+        )
+
+    @functools.cached_property
+    def client(self):
+        """Gemini client, created on first request; cached only when enable_cache is set."""
+        from gemini_client import GeminiClient
+        return GeminiClient(
+            os.getenv('GOOGLE_API_KEY'),
+            cache=self.cache if self.enable_cache else None
+        )
+
+    @functools.cached_property
+    def _generate(self):
+        """Gemini generate call, optionally memoized in-process.
+
+        Gemini responses are non-deterministic and every post should be fresh,
+        so both the in-process memo and the SQLite cache are off unless
+        enable_cache is set (dev/testing).
+        """
+        if self.enable_cache:
+            return functools.lru_cache(maxsize=4096)(self.client.generate)
+        return self.client.generate
+
+    def _make_request(self, prompt, stream=False):
+        """Make a request to Gemini API, serving repeated prompts from the cache if enabled."""
+        return self._generate(prompt, stream=stream)
+
+    def generate_and_post(self):
+        """Generate content and post to LinkedIn."""
+        try:
+            # Generate content, streaming the raw text while it is written
+            print("\nGenerating content...\n")
+            content = self.generate_content(stream=True)
+            logger.info("Content generated successfully")
+            self._post_content(content)
+            self._save_posts([content])
+
+        except Exception as e:
+            logger.error(f"Error in generate_and_post: {str(e)}")
+            print(f"\nError: {str(e)}")
+
+    def generate_and_post_many(self, n):
+        """Generate n pieces of content concurrently and post them in a single batch."""
+        try:
+            contents = self.generate_many(n)
+            logger.info(f"Generated {len(contents)} posts")
+        except Exception as e:
+            logger.error(f"Error in generate_and_post_many: {str(e)}")
+            print(f"\nError: {str(e)}")
+            return
+
+        posted = []
+        try:
+            if len(contents) > 1:
+                # Post the whole batch in one BATCH_CREATE round-trip
+                posted = self._post_contents(contents)
+            else:
+                for content in contents:
+                    self._post_content(content)
+                    posted.append(content)
+        except Exception as e:
+            logger.error(f"Error in generate_and_post_many: {str(e)}")
+            print(f"\nError: {str(e)}")
+        finally:
+            # Save the whole batch with a single open and buffered write
+            if posted:
+                self._save_posts(posted)
+
+    def generate_many(self, n, max_concurrent=None):
+        """Generate n posts with up to max_concurrent Gemini requests in flight."""
+        if n <= 0:
+            return []
+        specs = [self._build_prompt(choice) for choice in _draw_choices(n)]
+        contents = [self._lookup_template(spec) for spec in specs]
         
-        # Generate the content
-        response = self._make_request(prompt)
-        content = response['candidates'][0]['content']['parts'][0]['text'].strip()
-        
-        # Remove any asterisks from the content
-        content = content.replace('*', '')
-        
-        # Remove prefix labels like "Story:", "Curious:", etc.
-        content_lines = content.split('\n')
-        if content_lines and any(content_lines[0].startswith(label) for label in ['Story:', 'Curious:', 'Bold:', 'Relatable:', 'Contrarian:', 'Metric:', 'Question:', 'Revelation:']):
-            content_lines[0] = content_lines[0].split(':', 1)[1].strip()
-            content = '\n'.join(content_lines)
-        
-        # Add emojis if they're not already present
-        content_lines = content.split('\n')
-        if not any(emoji in content_lines[0] for emoji in EMOJIS["opening"]):
-            content_lines[0] = f"{random.choice(EMOJIS['opening'])} {content_lines[0]}"
-        
-        # Add emojis to key points
-        for i, line in enumerate(content_lines[1:], 1):
-            if line.strip() and not any(emoji in line for emoji in EMOJIS["key_points"]):
-                content_lines[i] = f"{random.choice(EMOJIS['key_points'])} {line}"
-        
-        # Add emoji to conclusion if not present
-        if content_lines and not any(emoji in content_lines[-2] for emoji in EMOJIS["conclusion"]):
-            content_lines[-2] = f"{random.choice(EMOJIS['conclusion'])} {content_lines[-2]}"
+        # Only prompts without a reusable template response go to Gemini
+        misses = [i for i, content in enumerate(contents) if content is None]
+        generated = self.generate_batch([specs[i][0] for i in misses], max_concurrent)
+        for i, content in zip(misses, generated):
+            self._store_template(specs[i], content)
+            contents[i] = content
         
-        # Add emoji to call to action if not present
-        if content_lines and not any(emoji in content_lines[-1] for emoji in EMOJIS["call_to_action"]):
-            content_lines[-1] = f"{random.choice(EMOJIS['call_to_action'])} {content_lines[-1]}"
+        return [
+            self._format_post(content, spec[1])
+            for content, spec in zip(contents, specs)
+        ]
+
+    def _post_content(self, content):
+        """Print and post a single piece of generated content to LinkedIn."""
+        print("\nGenerated content:")
+        print("=" * 50)
+        print(content)
+        print("=" * 50)
+
+        # Post to LinkedIn
+        response = self.linkedin_client.submit_share(text=content)
+        logger.info(f"Post created successfully! Post ID: {response['updateKey']}")
+        print(f"\nPost created successfully! Post ID: {response['updateKey']}")
+
+    def _post_contents(self, contents):
+        """Print and post several pieces of content in one request, returning those that were created.
+
+        If the batch request provably created nothing (it never reached
+        LinkedIn or was rejected with a 4xx), each post is sent on its own so
+        one bad request doesn't lose the whole run. Other failures are raised,
+        since re-sending could publish duplicates.
+        """
+        from linkedin_api import SharesNotCreatedError
+
+        for content in contents:
+            print("\nGenerated content:")
+            print("=" * 50)
+            print(content)
+            print("=" * 50)
+
+        try:
+            responses = self.linkedin_client.submit_share_batch([{"text": content} for content in contents])
+        except SharesNotCreatedError as e:
+            logger.warning(f"Batch post failed, posting one at a time: {str(e)}")
+            return self._post_each(contents)
+
+        posted = []
+        for content, response in zip(contents, responses):
+            if response is None:
+                print("\nError: LinkedIn did not confirm one of the posts")
+                continue
+            logger.info(f"Post created successfully! Post ID: {response['updateKey']}")
+            print(f"\nPost created successfully! Post ID: {response['updateKey']}")
+            posted.append(content)
+        return posted
+
+    def _post_each(self, contents):
+        """Post contents one request at a time, logging failures and continuing."""
+        posted = []
+        for content in contents:
+            try:
+                response = self.linkedin_client.submit_share(text=content)
+            except Exception as e:
+                logger.error(f"Error posting content: {str(e)}")
+                print(f"\nError: {str(e)}")
+                continue
+            logger.info(f"Post created successfully! Post ID: {response['updateKey']}")
+            print(f"\nPost created successfully! Post ID: {response['updateKey']}")
+            posted.append(content)
+        return posted
+
+    def _save_posts(self, posts):
+        """Queue posts to be appended to today's JSONL archive on the background writer."""
+        now = datetime.now()
+        filename = f"tech_leadership_content_{now:%Y%m%d}.jsonl"
+        lines = [
+            json.dumps({"ts": now.isoformat(timespec="seconds"), "post": post}, ensure_ascii=False) + "\n"
+            for post in posts
+        ]
+        _archive_writer.submit(_append_lines, filename, lines).add_done_callback(_log_write_error)
+        print(f"\nContent saved to {filename}")
+
+    def generate_content(self, stream=False):
+        """Generate tech leadership content."""
+        spec = self._build_prompt()
+        prompt, location = spec[0], spec[1]
         
-        content = '\n'.join(content_lines)
+        content = self._lookup_template(spec)
+        if content is None:
+            # Generate the content
+            response = self._make_request(prompt, stream=stream)
+            content = self.client.extract_text(response)
+            self._store_template(spec, content)
+        return self._format_post(content, location)
+
+    def generate_batch(self, prompts, max_concurrent=None):
+        """Generate the text for several prompts, returned in prompt order."""
+        if max_concurrent is None:
+            max_concurrent = int(os.getenv('GEMINI_MAX_CONCURRENT', 4))
+        with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
+            responses = list(executor.map(self._make_request, prompts))
+        return [self.client.extract_text(response) for response in responses]
+
+    def _template_key(self, template_id, topic):
+        """Cache key shared by every location rendering the same template and topic."""
+        return LLMCache.make_key(self.client.api_url, f"template:{template_id}:{topic}")
+
+    def _lookup_template(self, spec):
+        """Return a cached response for the spec's template, localized to its city.
+
+        Always misses unless enable_cache is set, so posted content is never
+        reused text from an earlier post.
+        """
+        if not self.enable_cache:
+            return None
+        prompt, location, topic, template_id = spec
+        cached = self.cache.get(self._template_key(template_id, topic))
+        if cached is None:
+            return None
+        logger.info(f"Template cache hit for '{topic}' in {location}")
+        return cached.replace(LOCATION_PLACEHOLDER, location)
+
+    def _store_template(self, spec, content):
+        """Store a response with its city name swapped for a placeholder, if enable_cache is set."""
+        if not self.enable_cache:
+            return
+        prompt, location, topic, template_id = spec
+        skeleton = re.sub(rf"\b{re.escape(location)}\b", LOCATION_PLACEHOLDER, content)
+        self.cache.set(self._template_key(template_id, topic), skeleton)
+
+    def _build_prompt(self, choice=None):
+        """Build a randomized prompt, optionally from a pre-drawn choice.
+
+        Returns a (prompt, location, topic, template_id) tuple.
+        """
+        # Select a random location, topic and content type in one draw
+        location, topic, template_id = choice or _draw_choices(1)[0]
+        content_type = CONTENT_TYPES[template_id].format_map({"topic": topic, "location": location})
         
-        # Combine location-specific and general hashtags
-        all_hashtags = location_data["hashtags"] + GENERAL_HASHTAGS
-        selected_hashtags = random.sample(all_hashtags, random.randint(5, 7))
+        # Select a random hook style
+        hook_style = _rng.choice(HOOK_STYLES).format_map({"topic": topic})
         
-        # Format the final post
-        post = f"{content}\n\n{' '.join(selected_hashtags)}"
+        # Generate the prompt
+        prompt = _PROMPT_TEMPLATE.format_map({
+            "content_type": content_type,
+            "hook_style": hook_style,
+            "location": location
+        })
         
-        return post
+        return prompt, location, topic, template_id
+
+    def _format_post(self, content, location):
+        """Clean up generated text, add emojis and append hashtags."""
+        return _decorate(content, location)
 
 def main():
+    # Load .env and open the log file only when the generator actually runs
+    import config
+    configure_logging(
+        level=config.LOG_LEVEL,
+        filename=config.LOG_FILE or 'tech_leadership_content.log'
+    )
+    
     try:
-        generator = TechLeadershipContentGenerator()
-        generator.generate_and_post()
+        generator = TechLeadershipContentGenerator(enable_cache=config.LLM_MEMOIZE)
+        post_count = config.POST_COUNT
+        if post_count > 1:
+            generator.generate_and_post_many(post_count)
+        else:
+            generator.generate_and_post()
         
     except Exception as e:
         print(f"Error: {str(e)}")
@@ -0,0 +1,27 @@
+import os
+from dotenv import load_dotenv
+from llm_cache import DEFAULT_TTL
+
+# Load .env once per process; importers read the values below instead of
+# calling os.getenv themselves
+load_dotenv()
+
+# LinkedIn OAuth and API credentials
+LINKEDIN_CLIENT_ID = os.getenv('LINKEDIN_CLIENT_ID')
+LINKEDIN_CLIENT_SECRET = os.getenv('LINKEDIN_CLIENT_SECRET')
+LINKEDIN_REDIRECT_URI = os.getenv('LINKEDIN_REDIRECT_URI')
+LINKEDIN_ACCESS_TOKEN = os.getenv('LINKEDIN_ACCESS_TOKEN')
+
+# Google Gemini API and the response cache
+GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
+LLM_CACHE_FILE = os.getenv('LLM_CACHE_FILE', 'cache.db')
+LLM_CACHE_TTL = int(os.getenv('LLM_CACHE_TTL', DEFAULT_TTL))
+# Serve repeated prompts from the cache instead of fresh responses (dev/testing)
+LLM_MEMOIZE = os.getenv('LLM_MEMOIZE', 'false').lower() == 'true'
+
+# Logging
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_FILE = os.getenv('LOG_FILE')
+
+# Posts generated per run by the posting scripts
+POST_COUNT = int(os.getenv('POST_COUNT', 1))
@@ -0,0 +1,206 @@
+import io
+import os
+import sys
+import json
+import time
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from rate_limit import RateLimiter, RETRY_STATUSES, backoff_delay
+
+logger = logging.getLogger(__name__)
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+# (connect, read) timeout in seconds for every Gemini request
+REQUEST_TIMEOUT = (5, 45)
+
+# Attempts per request for rate_limit.RETRY_STATUSES responses
+MAX_ATTEMPTS = 5
+
+# Headers are the same for every request; never mutated
+_HEADERS = {'Content-Type': 'application/json'}
+
+class RateLimitedError(Exception):
+    """Raised when Gemini answers with a rate limit or transient server error."""
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def _build_session():
+    """Create a session that reuses connections to the Gemini host and retries failed connections."""
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            allowed_methods=frozenset(['POST'])
+        )
+    ))
+    return session
+
+def _check_response(response):
+    """Raise RateLimitedError for retryable statuses and Exception for other failures."""
+    if response.status_code in RETRY_STATUSES:
+        raise RateLimitedError(
+            f"API request failed with status {response.status_code}: {response.text}",
+            retry_after=response.headers.get('Retry-After') if response.status_code == 429 else None
+        )
+    if response.status_code != 200:
+        raise Exception(f"API request failed: {response.text}")
+
+# Shared by every GeminiClient so generators in one process use a single pool
+_SESSION = _build_session()
+
+# Default client-side cap, the free tier's requests per minute for gemini-2.0-flash
+DEFAULT_RPM = 15
+
+# Requests let through back to back before pacing starts; a full bucket of
+# GEMINI_RPM tokens would let a whole batch through at once
+RATE_LIMIT_BURST = 2
+
+# Shared by every GeminiClient so the whole process stays under GEMINI_RPM;
+# created on first use so the value is read after .env is loaded
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+def _shared_rate_limiter():
+    """Return the process-wide Gemini rate limiter, creating it on first call."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter(int(os.getenv('GEMINI_RPM', DEFAULT_RPM)), 60, burst=RATE_LIMIT_BURST)
+        return _rate_limiter
+
+class GeminiClient:
+    """Shared client for the Gemini generateContent REST API."""
+    __slots__ = ('api_key', 'api_url', 'stream_url', 'cache', '_generate_url', '_stream_url',
+                 'rate_limiter', 'session')
+
+    def __init__(self, api_key, model=DEFAULT_MODEL, cache=None):
+        self.api_key = api_key
+        self.api_url = f"{GEMINI_BASE_URL}/{model}:generateContent"
+        self.stream_url = f"{GEMINI_BASE_URL}/{model}:streamGenerateContent"
+        self.cache = cache
+
+        # Full request URLs, built once instead of on every call
+        self._generate_url = f"{self.api_url}?key={api_key}"
+        self._stream_url = f"{self.stream_url}?alt=sse&key={api_key}"
+
+        # Pace requests client-side so batches stay under the plan's RPM
+        self.rate_limiter = _shared_rate_limiter()
+
+        self.session = _SESSION
+
+    def generate(self, prompt, stream=False, system_instruction=None):
+        """Make a request to Gemini API, serving repeated prompts from the cache if one is set.
+
+        With stream=True the response text is echoed to stdout as it arrives;
+        TechLeadershipContentGenerator.generate_and_post uses this.
+        A system_instruction is sent separately from the prompt, so the fixed
+        instructions form an identical prefix on every call.
+        """
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(self.api_url, prompt, system_instruction)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Cache hit for prompt (stats: {self.cache.stats})")
+                return cached
+
+        data = {
+            "contents": [{
+                "parts": [{"text": prompt}]
+            }]
+        }
+        if system_instruction:
+            data["systemInstruction"] = {"parts": [{"text": system_instruction}]}
+        # Encode the body once, compactly, instead of letting requests re-serialize it
+        body = json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        try:
+            response_json = self._request_with_retry(_HEADERS, body, stream)
+            if cache_key is not None:
+                self.cache.set(cache_key, response_json)
+            return response_json
+        except Exception as e:
+            logger.error(f"Request failed: {str(e)}")
+            raise
+
+    def _request_with_retry(self, headers, body, stream=False):
+        """Send a request, retrying rate limits and server errors with rate_limit.backoff_delay."""
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                self.rate_limiter.acquire()
+                if stream:
+                    return self._stream_request(headers, body)
+                response = self.session.post(
+                    self._generate_url,
+                    headers=headers,
+                    data=body,
+                    timeout=REQUEST_TIMEOUT
+                )
+                _check_response(response)
+                return response.json()
+            except RateLimitedError as e:
+                if attempt == MAX_ATTEMPTS:
+                    raise
+                wait = backoff_delay(attempt - 1, retry_after=e.retry_after)
+                logger.warning(f"{str(e)}; retrying in {wait:.1f} seconds (attempt {attempt}/{MAX_ATTEMPTS})")
+                time.sleep(wait)
+
+    def generate_text(self, prompt, stream=False, system_instruction=None):
+        """Generate a response and return its stripped text."""
+        return self.extract_text(self.generate(prompt, stream=stream, system_instruction=system_instruction))
+
+    @staticmethod
+    def extract_text(response):
+        """Return the stripped text of the first candidate in a response.
+
+        Raises Exception with the block or finish reason when there is no text.
+        """
+        try:
+            return response['candidates'][0]['content']['parts'][0]['text'].strip()
+        except (KeyError, IndexError, TypeError):
+            candidates = response.get('candidates') if isinstance(response, dict) else None
+            if candidates:
+                reason = f"finishReason {candidates[0].get('finishReason', 'unknown')}"
+            elif isinstance(response, dict) and 'promptFeedback' in response:
+                reason = f"prompt blocked: {response['promptFeedback'].get('blockReason', 'unknown')}"
+            else:
+                reason = "no candidates"
+            raise Exception(f"Gemini response has no text ({reason})")
+
+    def _stream_request(self, headers, body, out=None):
+        """Stream a response over SSE, writing text chunks to out as they arrive.
+
+        Returns the full text wrapped in the same shape as a generateContent response.
+        """
+        out = out or sys.stdout
+        buffer = io.StringIO()
+        with self.session.post(
+            self._stream_url,
+            headers=headers,
+            data=body,
+            stream=True,
+            timeout=REQUEST_TIMEOUT
+        ) as response:
+            _check_response(response)
+            # text/event-stream has no charset, which requests would decode as ISO-8859-1
+            response.encoding = 'utf-8'
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                chunk = json.loads(line[len('data:'):])
+                for candidate in chunk.get('candidates', [])[:1]:
+                    for part in candidate.get('content', {}).get('parts', []):
+                        text = part.get('text', '')
+                        buffer.write(text)
+                        out.write(text)
+                out.flush()
+
+        return {"candidates": [{"content": {"parts": [{"text": buffer.getvalue()}]}}]}
@@ -1,27 +1,20 @@
 import random
-from datetime import datetime, timedelta
+
+def random_hour_minutes(num_timings=20):
+    # Pick distinct random minutes within 24 hours (1440 minutes) as sorted (hour, minute) pairs
+    return [divmod(minute, 60) for minute in sorted(random.sample(range(1440), num_timings))]
 
 def generate_random_timings(num_timings=20):
-    # Generate random minutes within 24 hours (1440 minutes)
-    minutes = sorted(random.sample(range(1440), num_timings))
-    
     # Convert minutes to HH:MM format
-    timings = []
-    for minute in minutes:
-        hours = minute // 60
-        mins = minute % 60
-        timings.append(f"{hours:02d}:{mins:02d}")
-    
-    return timings
+    return [f"{hours:02d}:{mins:02d}" for hours, mins in random_hour_minutes(num_timings)]
 
 if __name__ == "__main__":
-    timings = generate_random_timings()
+    hour_minutes = random_hour_minutes()
     print("Generated random timings (HH:MM):")
-    for time in timings:
-        print(time)
+    for hour, minute in hour_minutes:
+        print(f"{hour:02d}:{minute:02d}")
     
     # Also print in cron format
     print("\nCron format:")
-    for time in timings:
-        hour, minute = time.split(":")
-        print(f"{minute} {hour} * * *") 
\ No newline at end of file
+    for hour, minute in hour_minutes:
+        print(f"{minute:02d} {hour:02d} * * *")
@@ -1,130 +1,311 @@
 import os
-import requests
-from dotenv import load_dotenv
-import logging
 import json
+import time
+import hashlib
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from rate_limit import request_with_backoff, SAFE_RETRY_ERRORS
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    filename='linkedin_api.log'
-)
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
+# (connect, read) timeout in seconds for LinkedIn API requests
+REQUEST_TIMEOUT = (5, 30)
+
+# Seconds a fetched userinfo profile is reused before it is requested again
+PROFILE_TTL = 60 * 60
+
+# Seconds a successful validate_token result is trusted without a new request
+VALIDATION_TTL = 5 * 60
+
+# Member IDs by token hash, shared by every process run by this user
+USER_ID_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'linkedin_automation', 'user_id.json')
+
+def _token_hash(access_token):
+    """Key a token by its SHA-256 hex digest, so the raw token is never stored."""
+    return hashlib.sha256(access_token.encode('utf-8')).hexdigest() if access_token else ''
+
+def _read_user_id_cache():
+    """Return the on-disk token hash -> member ID map, or {} if it can't be read."""
+    try:
+        with open(USER_ID_CACHE_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _write_user_id_cache(token_key, user_id):
+    """Record the member ID for a token hash, replacing the cache file atomically."""
+    try:
+        entries = _read_user_id_cache()
+        entries[token_key] = user_id
+        os.makedirs(os.path.dirname(USER_ID_CACHE_FILE), exist_ok=True)
+        tmp_path = f"{USER_ID_CACHE_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, USER_ID_CACHE_FILE)
+    except OSError as e:
+        logger.warning("Could not write user ID cache: %s", e)
+
+def save_user_id(access_token, user_id):
+    """Remember the member ID for a token, so LinkedInAPI skips the userinfo lookup for it."""
+    _write_user_id_cache(_token_hash(access_token), user_id)
+
+class LinkedInAPIError(Exception):
+    """Raised for an error response from the LinkedIn API."""
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+class SharesNotCreatedError(Exception):
+    """Raised when a batch share request never reached LinkedIn or was rejected outright."""
+
+# Key of the share payload inside specificContent, and the author URN format
+SHARE_CONTENT_KEY = "com.linkedin.ugc.ShareContent"
+_PERSON_URN_FMT = "urn:li:person:{}".format
+
+# Share fields that are the same for every post; never mutated
+_SHARE_TEMPLATE = {
+    "lifecycleState": "PUBLISHED",
+    "visibility": {
+        "com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"
+    }
+}
 
 class LinkedInAPI:
-    def __init__(self, access_token):
-        """Initialize the LinkedIn API client with an access token."""
+    """LinkedIn API wrapper for handling authentication and API requests."""
+    __slots__ = ('access_token', 'base_url', 'session', '_profile', '_profile_fetched',
+                 '_author_urn', '_user_id', '_token_key', '_validation_cache')
+
+    def __init__(self, access_token, user_id=None):
         self.access_token = access_token
         self.base_url = "https://api.linkedin.com/v2"
-        self.headers = {
-            'Authorization': f'Bearer {self.access_token}',
+        
+        # Keep connections to the LinkedIn host alive between calls, with the
+        # static headers set once on the session instead of per request
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Authorization': f'Bearer {access_token}',
             'Content-Type': 'application/json',
             'X-Restli-Protocol-Version': '2.0.0',
             'LinkedIn-Version': '202304'
-        }
+        })
+        self.session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0))
+        
+        # Cached userinfo profile and the monotonic time it was fetched
+        self._profile = None
+        self._profile_fetched = 0.0
+        self._author_urn = None
+        
+        # Member ID, if the caller knows it; otherwise looked up per token in get_user_id
+        self._user_id = user_id
+        
+        # Successful validations by token hash (never the raw token) -> monotonic expiry
+        self._token_key = _token_hash(access_token)
+        self._validation_cache = {}
 
-    def get_profile(self):
-        """Get the user's profile information using OpenID Connect userinfo endpoint."""
+    def _make_request(self, method, endpoint, data=None, headers=None):
+        """Make an API request with error handling."""
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        # Encode the body once, compactly, instead of letting requests re-serialize it
+        body = None
+        if data is not None:
+            body = json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
         try:
-            response = requests.get(
-                f"{self.base_url}/userinfo",  # OpenID Connect userinfo endpoint
-                headers=self.headers
-            )
+            response = request_with_backoff(self.session, method, url, data=body, headers=headers, timeout=REQUEST_TIMEOUT)
             
-            if response.status_code == 200:
-                profile_data = response.json()
-                logger.info(f"Successfully retrieved user profile: {profile_data.get('name')}")
-                return profile_data
-            else:
-                logger.error(f"Failed to get profile: {response.status_code} - {response.text}")
-                return None
+            if response.status_code == 401:
+                self._profile = None
+                self._author_urn = None
+                self._user_id = None
+                self._validation_cache.pop(self._token_key, None)
+                raise LinkedInAPIError("Invalid or expired access token", 401)
+            elif response.status_code == 403:
+                raise LinkedInAPIError("Insufficient permissions or rate limit exceeded", 403)
+            elif response.status_code >= 400:
+                raise LinkedInAPIError(f"API request failed: {response.text}", response.status_code)
                 
+            return response
         except requests.exceptions.RequestException as e:
-            logger.error(f"Request failed: {str(e)}")
-            return None
+            logger.error("Request failed: %s", e)
+            raise
+
+    def get_profile(self):
+        """Get the user's profile from the OpenID Connect userinfo endpoint.
+
+        The profile is cached for PROFILE_TTL seconds; the member ID in it
+        doesn't change for the lifetime of the token.
+        """
+        if self._profile is not None and time.monotonic() - self._profile_fetched < PROFILE_TTL:
+            return self._profile
+        response = self._make_request('GET', 'userinfo')
+        if response.status_code != 200:
+            raise Exception(f"Failed to get profile: {response.text}")
+        profile_data = response.json()
+        logger.info("Successfully retrieved user profile: %s", profile_data.get('name'))
+        self._profile = profile_data
+        self._profile_fetched = time.monotonic()
+        return profile_data
 
     def get_user_id(self):
-        """Get the user's LinkedIn ID from the OpenID Connect userinfo response."""
-        profile = self.get_profile()
-        if profile and 'sub' in profile:  # 'sub' is the user identifier in OpenID Connect
-            return profile['sub']
-        return None
-
-    def submit_share(self, text, url=None, title=None, description=None):
-        """Submit a share to LinkedIn."""
+        """Get the current user's LinkedIn ID using OpenID Connect.
+
+        The ID is remembered per token, in memory and in USER_ID_CACHE_FILE,
+        so other processes using the same token skip the userinfo request.
+        """
+        if self._user_id:
+            return self._user_id
+        if self._token_key:
+            self._user_id = _read_user_id_cache().get(self._token_key)
+            if self._user_id:
+                return self._user_id
         try:
-            # Get the user's ID
-            user_id = self.get_user_id()
+            user_id = self.get_profile().get('sub')
             if not user_id:
-                logger.error("Failed to get user ID")
-                return None
-
-            # Construct the request body
-            share_body = {
-                "author": f"urn:li:member:{user_id}",  # Using member URN format
-                "lifecycleState": "PUBLISHED",
-                "specificContent": {
-                    "com.linkedin.ugc.ShareContent": {
-                        "shareCommentary": {
-                            "text": text
-                        },
-                        "shareMediaCategory": "NONE"
-                    }
-                },
-                "visibility": {
-                    "com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"
+                raise Exception("Could not find user ID in profile response")
+            self._user_id = user_id
+            if self._token_key:
+                _write_user_id_cache(self._token_key, user_id)
+            return user_id
+        except Exception as e:
+            logger.error("Error getting user ID: %s", e)
+            raise
+
+    def get_author_urn(self):
+        """Get the person URN used as the author of shares, looked up once per token."""
+        if self._author_urn is None:
+            self._author_urn = _PERSON_URN_FMT(self.get_user_id())
+        return self._author_urn
+
+    def _build_share(self, text, title=None, description=None, url=None):
+        """Build the ugcPosts body for a share."""
+        # Prepare the share content from the cached author URN and the shared template
+        share_content = {
+            "author": self.get_author_urn(),
+            **_SHARE_TEMPLATE,
+            "specificContent": {
+                SHARE_CONTENT_KEY: {
+                    "shareCommentary": {
+                        "text": text
+                    },
+                    "shareMediaCategory": "NONE"
                 }
             }
+        }
 
-            # If URL is provided, add it to the share
-            if url:
-                share_body["specificContent"]["com.linkedin.ugc.ShareContent"]["shareMediaCategory"] = "ARTICLE"
-                share_body["specificContent"]["com.linkedin.ugc.ShareContent"]["media"] = [{
+        # If URL is provided, update the share content for article sharing
+        if url:
+            share_content["specificContent"][SHARE_CONTENT_KEY].update({
+                "shareMediaCategory": "ARTICLE",
+                "media": [{
                     "status": "READY",
-                    "description": {
-                        "text": description or ""
-                    },
                     "originalUrl": url,
-                    "title": {
-                        "text": title or ""
-                    }
+                    **({"title": {"text": title}} if title else {}),
+                    **({"description": {"text": description}} if description else {})
                 }]
+            })
 
-            logger.info(f"Sending share request with body: {json.dumps(share_body, indent=2)}")
+        return share_content
+
+    def submit_share(self, text, title=None, description=None, url=None):
+        """
+        Create a share on LinkedIn.
+        
+        Args:
+            text (str): The main text content of the share
+            title (str, optional): Title for the share when sharing a URL
+            description (str, optional): Description for the share when sharing a URL
+            url (str, optional): URL to be shared
             
-            # Make the API request
-            response = requests.post(
-                f"{self.base_url}/ugcPosts",
-                headers=self.headers,
-                json=share_body
-            )
+        Returns:
+            dict: Response containing the share ID
+        """
+        try:
+            share_content = self._build_share(text, title, description, url)
 
+            # Log the request body for debugging, only serializing it when DEBUG is on
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Creating share with body: %s", json.dumps(share_content, ensure_ascii=False))
+
+            # Make the API request
+            response = self._make_request('POST', 'ugcPosts', share_content)
+            
             if response.status_code in [200, 201]:
-                logger.info("Successfully created share")
-                return response.json()
+                share_id = response.headers.get('x-restli-id')
+                logger.info("Successfully created share with ID: %s", share_id)
+                return {"updateKey": share_id}
             else:
-                logger.error(f"Failed to create share: {response.status_code} - {response.text}")
-                return None
+                raise Exception(f"Failed to create share: {response.text}")
+                
+        except Exception as e:
+            logger.error("Error creating share: %s", e)
+            raise
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request failed: {str(e)}")
-            return None
+    def submit_share_batch(self, posts):
+        """
+        Create several shares with a single BATCH_CREATE request to ugcPosts.
+        
+        Args:
+            posts (list): dicts of submit_share keyword arguments (text, title, description, url)
+            
+        Returns:
+            list: {"updateKey": share_id} per post, or None for posts LinkedIn rejected
+                or whose result can't be matched to the request
+
+        Raises:
+            SharesNotCreatedError: the request never reached LinkedIn or got a
+                4xx response, so it is safe to send the posts again. Any other
+                failure may mean some shares were created, and is re-raised as is.
+        """
+        try:
+            elements = [self._build_share(**post) for post in posts]
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Creating %d shares with body: %s", len(elements), json.dumps(elements, ensure_ascii=False))
+
+            try:
+                response = self._make_request('POST', 'ugcPosts', {"elements": elements},
+                                              headers={'X-RestLi-Method': 'BATCH_CREATE'})
+            except SAFE_RETRY_ERRORS as e:
+                raise SharesNotCreatedError(f"Batch create never reached LinkedIn: {e}") from e
+            except LinkedInAPIError as e:
+                if e.status_code is not None and e.status_code < 500:
+                    raise SharesNotCreatedError(f"Batch create rejected: {e}") from e
+                raise
+            if response.status_code not in [200, 201]:
+                raise Exception(f"Failed to create shares: {response.text}")
+
+            # Each element carries its own status and, on success, the new share's ID
+            statuses = response.json().get('elements', [])
+            if len(statuses) != len(elements):
+                logger.error("Batch create returned %d results for %d shares", len(statuses), len(elements))
+                return [None] * len(elements)
+            results = []
+            for i, element in enumerate(statuses):
+                if element.get('status') in (200, 201):
+                    logger.info("Successfully created share with ID: %s", element.get('id'))
+                    results.append({"updateKey": element.get('id')})
+                else:
+                    logger.error("Failed to create share %d/%d: %s", i + 1, len(elements), element.get('error', element))
+                    results.append(None)
+            return results
+
+        except Exception as e:
+            logger.error("Error creating shares: %s", e)
+            raise
 
     def validate_token(self):
-        """Validate the access token by attempting to get the user's profile."""
+        """Validate the access token by requesting the user's profile.
+
+        A successful result is reused for VALIDATION_TTL seconds.
+        """
+        expires = self._validation_cache.get(self._token_key)
+        if expires is not None and expires > time.monotonic():
+            return True
         try:
-            response = requests.get(
-                f"{self.base_url}/userinfo",  # Using OpenID Connect userinfo endpoint
-                headers=self.headers
-            )
-            if response.status_code == 200:
-                profile = response.json()
-                logger.info(f"Token validated successfully for user: {profile.get('name')}")
-                return True
+            self._profile = None
+            profile = self.get_profile()
+            logger.info("Token validated successfully for user: %s", profile.get('name'))
+            self._validation_cache[self._token_key] = time.monotonic() + VALIDATION_TTL
+            return True
+        except Exception as e:
+            logger.error("Token validation failed: %s", e)
             return False
-        except requests.exceptions.RequestException:
-            return False 
\ No newline at end of file
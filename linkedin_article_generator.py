@@ -3,26 +3,94 @@ import json
 import time
 import random
 import logging
-import requests
-from dotenv import load_dotenv
-from linkedin_menu import LinkedInAPI
-
-# Configure logging
-logging.basicConfig(
-    level=os.getenv('LOG_LEVEL', 'INFO'),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    filename=os.getenv('LOG_FILE', 'linkedin_articles.log')
-)
+from concurrent.futures import ThreadPoolExecutor
+from linkedin_api import LinkedInAPI
+from llm_cache import LLMCache, DEFAULT_TTL
+from gemini_client import GeminiClient
+from logging_setup import configure_logging
+
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
+# Prompt templates, filled with str.format per request
+_TOPIC_BRIEF = """Generate a viral LinkedIn post title based on this topic: {base_topic}
+
+        Theme: {theme_label} ({theme_emoji})
+        
+        Guidelines:
+        - Keep the essence of the original topic
+        - Add specific numbers or results where relevant
+        - Include 1-2 relevant emojis
+        - Make it attention-grabbing
+        - Keep it under 100 characters
+        - Make it specific and credible"""
+
+_ARTICLE_BRIEF = """Write a viral LinkedIn post about: {topic}
+
+        Follow this AIDA framework strictly:
+
+        1. ATTENTION (Hook):
+        - Use this hook style: {hook_style}
+        - Make it impossible to scroll past
+        - 2-3 lines maximum
+
+        2. INTEREST:
+        - Present the main problem or opportunity
+        - Add a surprising fact or statistic
+        - Use personal experience
+        - 2-3 lines
+
+        3. DESIRE:
+        - Share your main insights or solutions
+        - Include specific examples or results
+        - Add practical takeaways
+        - 3-4 lines
+
+        4. ACTION:
+        - End with an engaging question
+        - Encourage discussion
+        - Add 2-3 relevant hashtags
+        - 2 lines maximum
+
+        Format Requirements:
+        - Total length: 300-800 words
+        - Use short paragraphs (2-3 lines max)
+        - Add line breaks between sections
+        - Use 3-4 relevant emojis strategically
+        - Use these bullet markers sparingly: 👉 💡 🔑
+        - Make it skimmable
+        - Plain text only (no markdown)
+        - Write in a personal, conversational tone"""
+
+_TOPIC_PROMPT = """{brief}
+        
+        Return only the title with emojis, no additional text."""
+
+_ARTICLE_PROMPT = """{brief}
+
+        Return only the formatted post text."""
+
+_POST_PROMPT = """{topic_brief}
+
+        {article_brief}
+
+        Return only a JSON object with two string fields and no additional text:
+        {{"topic": "<the title with emojis>", "post": "<the formatted post text>"}}"""
+
+# Hook labels Gemini sometimes echoes at the start of an article
+_HOOK_LABELS = ('Story:', 'Curious:', 'Bold:', 'Relatable:', 'Contrarian:', 'Metric:', 'Question:', 'Revelation:')
 
 class ArticleGenerator:
     """Generates viral tech articles using Gemini API."""
-    def __init__(self, api_key):
-        self.api_key = api_key
-        self.api_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+    def __init__(self, api_key, enable_cache=False):
+        # Every topic and article should be freshly written, so responses are
+        # only cached when enable_cache is set (dev/testing)
+        self.cache = None
+        if enable_cache:
+            self.cache = LLMCache(
+                os.getenv('LLM_CACHE_FILE', 'cache.db'),
+                ttl=int(os.getenv('LLM_CACHE_TTL', DEFAULT_TTL))
+            )
+        self.client = GeminiClient(api_key, cache=self.cache)
         
         # Content themes
         self.content_themes = {
@@ -91,105 +159,73 @@ class ArticleGenerator:
         ]
 
     def _make_request(self, prompt):
-        """Make a request to Gemini API."""
-        headers = {
-            'Content-Type': 'application/json'
-        }
-        data = {
-            "contents": [{
-                "parts": [{"text": prompt}]
-            }]
-        }
-        try:
-            response = requests.post(
-                f"{self.api_url}?key={self.api_key}",
-                headers=headers,
-                json=data
-            )
-            if response.status_code != 200:
-                raise Exception(f"API request failed: {response.text}")
-            return response.json()
-        except Exception as e:
-            logger.error(f"Request failed: {str(e)}")
-            raise
+        """Make a request to Gemini API, serving repeated prompts from the cache if enabled."""
+        return self.client.generate(prompt)
 
     def generate_viral_topic(self):
         """Generate a viral-worthy tech topic."""
-        # Randomly select a theme and topic
-        theme_key = random.choice(list(self.content_themes.keys()))
-        theme = self.content_themes[theme_key]
-        base_topic = random.choice(theme["topics"])
-        
-        prompt = f"""Generate a viral LinkedIn post title based on this topic: {base_topic}
-
-        Theme: {theme_key.replace('_', ' ').title()} ({theme['emoji']})
-        
-        Guidelines:
-        - Keep the essence of the original topic
-        - Add specific numbers or results where relevant
-        - Include 1-2 relevant emojis
-        - Make it attention-grabbing
-        - Keep it under 100 characters
-        - Make it specific and credible
-        
-        Return only the title with emojis, no additional text."""
+        prompt = _TOPIC_PROMPT.format(brief=self._topic_brief())
         
         response = self._make_request(prompt)
-        return response['candidates'][0]['content']['parts'][0]['text'].strip()
+        return self.client.extract_text(response)
 
     def generate_article(self, topic):
         """Generate an engaging article using the AIDA framework."""
-        # Select a random hook style
-        hook_style = random.choice(self.hook_styles)
+        prompt = _ARTICLE_PROMPT.format(brief=self._article_brief(topic))
         
-        prompt = f"""Write a viral LinkedIn post about: {topic}
-
-        Follow this AIDA framework strictly:
-
-        1. ATTENTION (Hook):
-        - Use this hook style: {hook_style}
-        - Make it impossible to scroll past
-        - 2-3 lines maximum
-
-        2. INTEREST:
-        - Present the main problem or opportunity
-        - Add a surprising fact or statistic
-        - Use personal experience
-        - 2-3 lines
-
-        3. DESIRE:
-        - Share your main insights or solutions
-        - Include specific examples or results
-        - Add practical takeaways
-        - 3-4 lines
-
-        4. ACTION:
-        - End with an engaging question
-        - Encourage discussion
-        - Add 2-3 relevant hashtags
-        - 2 lines maximum
+        response = self._make_request(prompt)
+        content = self.client.extract_text(response)
+        return self._clean_article(content, topic)
 
-        Format Requirements:
-        - Total length: 300-800 words
-        - Use short paragraphs (2-3 lines max)
-        - Add line breaks between sections
-        - Use 3-4 relevant emojis strategically
-        - Use these bullet markers sparingly: 👉 💡 🔑
-        - Make it skimmable
-        - Plain text only (no markdown)
-        - Write in a personal, conversational tone
+    def generate_post(self):
+        """Generate a viral topic and its article in a single Gemini request.
 
-        Return only the formatted post text."""
+        Falls back to separate topic and article requests if the combined
+        response can't be parsed.
+        """
+        prompt = _POST_PROMPT.format(topic_brief=self._topic_brief(), article_brief=self._article_brief("the title above"))
         
         response = self._make_request(prompt)
-        content = response['candidates'][0]['content']['parts'][0]['text'].strip()
+        text = self.client.extract_text(response)
+        try:
+            # Gemini often wraps JSON in ```json fences; parse from the first { to the last }
+            post = json.loads(text[text.find('{'):text.rfind('}') + 1])
+            topic = post["topic"].strip()
+            content = post["post"].strip()
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Could not parse combined topic/article response, falling back to two requests: {str(e)}")
+            topic = self.generate_viral_topic()
+            return topic, self.generate_article(topic)
+        return topic, self._clean_article(content, topic)
+
+    def _topic_brief(self):
+        """Build the topic prompt for a randomly chosen theme and base topic."""
+        # Randomly select a theme and topic
+        theme_key = random.choice(list(self.content_themes.keys()))
+        theme = self.content_themes[theme_key]
+        base_topic = random.choice(theme["topics"])
+        
+        return _TOPIC_BRIEF.format(
+            base_topic=base_topic,
+            theme_label=theme_key.replace('_', ' ').title(),
+            theme_emoji=theme['emoji']
+        )
+
+    def _article_brief(self, topic):
+        """Build the AIDA article prompt with a randomly chosen hook style."""
+        # Select a random hook style
+        hook_style = random.choice(self.hook_styles)
         
+        return _ARTICLE_BRIEF.format(topic=topic, hook_style=hook_style)
+
+    def _clean_article(self, content, topic):
+        """Strip markdown and hook labels from generated text and lead with the title."""
         # Remove any asterisks from the content
         content = content.replace('*', '')
         
         # Remove prefix labels like "Story:", "Curious:", etc.
         content_lines = content.split('\n')
-        if content_lines and any(content_lines[0].startswith(label) for label in ['Story:', 'Curious:', 'Bold:', 'Relatable:', 'Contrarian:', 'Metric:', 'Question:', 'Revelation:']):
+        if content_lines and content_lines[0].startswith(_HOOK_LABELS):
             content_lines[0] = content_lines[0].split(':', 1)[1].strip()
             content = '\n'.join(content_lines)
         
@@ -199,6 +235,13 @@ class ArticleGenerator:
         
         return content
 
+    def generate_posts(self, n, max_concurrent=None):
+        """Generate n (topic, article) pairs with up to max_concurrent posts in flight."""
+        if max_concurrent is None:
+            max_concurrent = int(os.getenv('GEMINI_MAX_CONCURRENT', 4))
+        with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
+            return list(executor.map(lambda _: self.generate_post(), range(n)))
+
 class AutoPoster:
     """Handles automatic posting with random intervals."""
     def __init__(self, linkedin_client, article_generator):
@@ -210,34 +253,73 @@ class AutoPoster:
     def generate_and_post(self):
         """Generate and post a single piece of content."""
         try:
-            # Generate viral topic
-            topic = self.article_generator.generate_viral_topic()
+            # Generate viral topic and article
+            topic, article = self.article_generator.generate_post()
             logger.info(f"Generated topic: {topic}")
-            
-            # Generate article
-            article = self.article_generator.generate_article(topic)
             logger.info("Generated content")
             
-            # Post to LinkedIn
-            response = self.linkedin_client.submit_share(text=article)
-            self.posts_count += 1
-            logger.info(f"Post #{self.posts_count} created successfully! Post ID: {response['updateKey']}")
-            print(f"\n[{time.strftime('%Y-%m-%d %H:%M:%S')}] Post #{self.posts_count} created!")
-            print(f"Topic: {topic}")
+            self._post(topic, article)
             
         except Exception as e:
             logger.error(f"Error in auto-posting: {str(e)}")
             print(f"\nError creating post: {str(e)}")
 
+    def generate_and_post_many(self, n):
+        """Generate n posts concurrently, then post them one by one."""
+        try:
+            posts = self.article_generator.generate_posts(n)
+            logger.info(f"Generated {len(posts)} posts")
+        except Exception as e:
+            logger.error(f"Error in auto-posting: {str(e)}")
+            print(f"\nError creating post: {str(e)}")
+            return
+        
+        self._post_all(posts)
+
+    def _post_all(self, posts):
+        """Post generated (topic, article) pairs, logging failures and continuing."""
+        for topic, article in posts:
+            try:
+                self._post(topic, article)
+            except Exception as e:
+                logger.error(f"Error in auto-posting: {str(e)}")
+                print(f"\nError creating post: {str(e)}")
+
+    def _post(self, topic, article):
+        """Post a generated article to LinkedIn."""
+        response = self.linkedin_client.submit_share(text=article)
+        self.posts_count += 1
+        logger.info(f"Post #{self.posts_count} created successfully! Post ID: {response['updateKey']}")
+        print(f"\n[{time.strftime('%Y-%m-%d %H:%M:%S')}] Post #{self.posts_count} created!")
+        print(f"Topic: {topic}")
+
     def start_auto_posting(self):
-        """Start automatic posting with random intervals."""
+        """Start automatic posting with random intervals.
+
+        The next round's posts are generated in the background while waiting,
+        so they are ready to post as soon as the interval ends.
+        """
         self.is_running = True
         print("\nStarting automatic posting mode...")
         print("Press Ctrl+C to stop")
         
+        post_count = max(1, int(os.getenv('POST_COUNT', 1)))
+        executor = ThreadPoolExecutor(max_workers=1)
         try:
+            next_posts = executor.submit(self.article_generator.generate_posts, post_count)
             while self.is_running:
-                self.generate_and_post()
+                try:
+                    posts = next_posts.result()
+                    logger.info(f"Generated {len(posts)} posts")
+                except Exception as e:
+                    logger.error(f"Error in auto-posting: {str(e)}")
+                    print(f"\nError creating post: {str(e)}")
+                    posts = []
+                
+                # Start on the next round before posting this one
+                next_posts = executor.submit(self.article_generator.generate_posts, post_count)
+                self._post_all(posts)
+                
                 # Random interval between 30 and 180 minutes
                 interval = random.randint(30, 180) * 60  # Convert minutes to seconds
                 logger.info(f"Waiting {interval//60} minutes until next post...")
@@ -248,11 +330,21 @@ class AutoPoster:
             self.is_running = False
             print("\nStopping automatic posting mode...")
             print(f"Total posts created: {self.posts_count}")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
 def main():
+    # Load .env and open the log file only when run as a script, so importers
+    # like AutomaticPoster keep their own log file
+    import config
+    configure_logging(
+        level=config.LOG_LEVEL,
+        filename=config.LOG_FILE or 'linkedin_articles.log'
+    )
+
     # Initialize components
-    linkedin_client = LinkedInAPI(os.getenv('LINKEDIN_ACCESS_TOKEN'))
-    article_generator = ArticleGenerator(os.getenv('GOOGLE_API_KEY'))
+    linkedin_client = LinkedInAPI(config.LINKEDIN_ACCESS_TOKEN)
+    article_generator = ArticleGenerator(config.GOOGLE_API_KEY, enable_cache=config.LLM_MEMOIZE)
     auto_poster = AutoPoster(linkedin_client, article_generator)
 
     while True:
@@ -1,28 +1,28 @@
 import os
-import json
+import html
 import webbrowser
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlencode, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlencode, urlsplit, unquote_plus
 import requests
-from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
-import time
+import threading
+from logging_setup import configure_logging
+import config
+from linkedin_api import save_user_id
 
 # Configure logging
-logging.basicConfig(
+configure_logging(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     filename='linkedin_auth.log'
 )
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
-
 # LinkedIn OAuth Configuration
-CLIENT_ID = os.getenv('LINKEDIN_CLIENT_ID')
-CLIENT_SECRET = os.getenv('LINKEDIN_CLIENT_SECRET')
-REDIRECT_URI = os.getenv('LINKEDIN_REDIRECT_URI')
+CLIENT_ID = config.LINKEDIN_CLIENT_ID
+CLIENT_SECRET = config.LINKEDIN_CLIENT_SECRET
+REDIRECT_URI = config.LINKEDIN_REDIRECT_URI
 SCOPES = [
     'openid',  # Required for OpenID Connect
     'profile', # For member's lite profile (id, name, picture)
@@ -30,6 +30,56 @@ SCOPES = [
     'w_member_social'  # For posting content
 ]
 
+# (connect, read) timeout in seconds for the token exchange
+REQUEST_TIMEOUT = (5, 30)
+
+def _build_session():
+    """Create a session that retries throttled and unconnected requests, honoring Retry-After.
+
+    Authorization codes are single-use, so a token POST is only retried when
+    the server cannot have used the code: on 429 or a failed connection. 5xx
+    and read errors are returned or raised at once.
+    """
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(max_retries=Retry(
+        total=5,
+        read=False,
+        backoff_factor=0.5,
+        status_forcelist=[429],
+        allowed_methods=frozenset(['GET', 'POST']),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )))
+    return session
+
+_SESSION = _build_session()
+
+# Callback pages; the success page never changes, so it is encoded once
+SUCCESS_HTML_BYTES = """
+<html>
+    <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 40px auto; text-align: center;">
+        <h1 style="color: #0077B5;">Authorization Successful! 🎉</h1>
+        <p>Your LinkedIn access token has been saved. You can close this window and return to the application.</p>
+        <p style="margin-top: 20px; padding: 10px; background-color: #f0f0f0; border-radius: 5px;">
+            The access token has been automatically saved to your .env file.
+        </p>
+    </body>
+</html>
+""".encode()
+
+ERROR_HTML_TEMPLATE = """
+<html>
+    <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 40px auto; text-align: center;">
+        <h1 style="color: #ff4444;">Authorization Failed ❌</h1>
+        <p>An error occurred during the authorization process:</p>
+        <p style="margin-top: 20px; padding: 10px; background-color: #fff0f0; border-radius: 5px; color: #ff4444;">
+            {msg}
+        </p>
+        <p>Please close this window and try again.</p>
+    </body>
+</html>
+"""
+
 def validate_config():
     """Validate required configuration values"""
     missing_vars = []
@@ -46,27 +96,53 @@ def validate_config():
 class OAuthHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         """Handle the OAuth callback"""
+        # Parse the query string once; it only carries a few single-valued params
+        url = urlsplit(self.path)
+        query = {}
+        for piece in url.query.split('&'):
+            key, _, value = piece.partition('=')
+            query[key] = unquote_plus(value)
+
+        # Favicons, prefetches and stray paths get a 404 and the server keeps
+        # waiting; only the real callback can end the flow
+        if url.path != (urlsplit(REDIRECT_URI or '').path or '/') or not ('code' in query or 'error' in query):
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        done = False
         try:
-            # Extract code from callback URL
-            if '?code=' in self.path:
-                code = parse_qs(self.path.split('?')[1])['code'][0]
+            code = query.get('code')
+            if code:
                 logger.info("Received authorization code")
                 
                 access_token = self.exchange_code_for_token(code)
                 
                 if access_token:
                     self.update_env_file(access_token)
+                    user_id = self.fetch_user_id(access_token)
+                    if user_id:
+                        save_user_id(access_token, user_id)
                     self.send_success_response()
+                    done = True
                 else:
                     self.send_error_response("Failed to get access token")
             else:
-                error = parse_qs(self.path.split('?')[1]).get('error', ['Unknown error'])[0]
-                error_description = parse_qs(self.path.split('?')[1]).get('error_description', [''])[0]
+                error = query.get('error') or 'Unknown error'
+                error_description = query.get('error_description', '')
                 self.send_error_response(f"{error}: {error_description}")
+                done = True
                 
         except Exception as e:
             logger.error(f"Error in callback handler: {str(e)}")
             self.send_error_response(str(e))
+        finally:
+            if done:
+                # Token saved or LinkedIn refused; stop serve_forever from another thread
+                threading.Thread(target=self.server.shutdown).start()
+            else:
+                logger.info("Still waiting for a callback; authorize again in the browser to retry")
 
     def exchange_code_for_token(self, code):
         """Exchange authorization code for access token"""
@@ -86,7 +162,7 @@ class OAuthHandler(BaseHTTPRequestHandler):
             }
             
             logger.info("Exchanging code for access token...")
-            response = requests.post(token_url, data=data, headers=headers)
+            response = _SESSION.post(token_url, data=data, headers=headers, timeout=REQUEST_TIMEOUT)
             
             if response.status_code == 200:
                 token_data = response.json()
@@ -101,11 +177,6 @@ class OAuthHandler(BaseHTTPRequestHandler):
                 else:
                     logger.error("No access token in response")
                     return None
-            elif response.status_code == 429:
-                retry_after = response.headers.get('Retry-After', 60)
-                logger.warning(f"Rate limit exceeded. Waiting {retry_after} seconds before retry")
-                time.sleep(int(retry_after))
-                return self.exchange_code_for_token(code)
             else:
                 logger.error(f"Token exchange failed: {response.text}")
                 return None
@@ -114,6 +185,21 @@ class OAuthHandler(BaseHTTPRequestHandler):
             logger.error(f"Request failed: {str(e)}")
             return None
 
+    def fetch_user_id(self, access_token):
+        """Look up the member ID for a new token so posting doesn't have to"""
+        try:
+            response = _SESSION.get(
+                'https://api.linkedin.com/v2/userinfo',
+                headers={'Authorization': f'Bearer {access_token}'},
+                timeout=REQUEST_TIMEOUT
+            )
+            if response.status_code == 200:
+                return response.json().get('sub')
+            logger.warning(f"Could not fetch user ID: {response.text}")
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Could not fetch user ID: {str(e)}")
+        return None
+
     def update_env_file(self, access_token):
         """Update .env file with the new access token"""
         try:
@@ -125,24 +211,26 @@ class OAuthHandler(BaseHTTPRequestHandler):
                 with open(env_path, 'r') as f:
                     env_lines = f.readlines()
             
-            # Update or add LINKEDIN_ACCESS_TOKEN
-            token_line = f'LINKEDIN_ACCESS_TOKEN={access_token}\n'
-            token_updated = False
-            
-            for i, line in enumerate(env_lines):
-                if line.startswith('LINKEDIN_ACCESS_TOKEN='):
-                    env_lines[i] = token_line
-                    token_updated = True
-                    break
-            
-            if not token_updated:
-                env_lines.append(token_line)
+            # Update or add LINKEDIN_ACCESS_TOKEN. The member ID is cached per
+            # token by linkedin_api, so a LINKEDIN_USER_ID left by older versions is dropped
+            values = {'LINKEDIN_ACCESS_TOKEN': access_token}
+            new_lines = [
+                f'{key}={values[key]}\n' if key in values else line
+                for line, key in ((line, line.partition('=')[0]) for line in env_lines)
+                if key in values or key != 'LINKEDIN_USER_ID'
+            ]
+            missing = [key for key in values if f'{key}={values[key]}\n' not in new_lines]
+            if missing and new_lines and not new_lines[-1].endswith('\n'):
+                new_lines[-1] += '\n'
+            new_lines.extend(f'{key}={values[key]}\n' for key in missing)
             
-            # Write back to .env file
-            with open(env_path, 'w') as f:
-                f.writelines(env_lines)
+            # Write to a temporary file and swap it in, so an interrupted write never truncates .env
+            tmp_path = env_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                f.writelines(new_lines)
+            os.replace(tmp_path, env_path)
                 
-            logger.info("Successfully updated .env file with access token")
+            logger.info(f"Successfully updated .env file with {', '.join(values)}")
             
         except Exception as e:
             logger.error(f"Error updating .env file: {str(e)}")
@@ -150,42 +238,19 @@ class OAuthHandler(BaseHTTPRequestHandler):
 
     def send_success_response(self):
         """Send success HTML response"""
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        
-        success_html = """
-        <html>
-            <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 40px auto; text-align: center;">
-                <h1 style="color: #0077B5;">Authorization Successful! 🎉</h1>
-                <p>Your LinkedIn access token has been saved. You can close this window and return to the application.</p>
-                <p style="margin-top: 20px; padding: 10px; background-color: #f0f0f0; border-radius: 5px;">
-                    The access token has been automatically saved to your .env file.
-                </p>
-            </body>
-        </html>
-        """
-        self.wfile.write(success_html.encode())
+        self._send_html(200, SUCCESS_HTML_BYTES)
 
     def send_error_response(self, error_message):
         """Send error HTML response"""
-        self.send_response(400)
-        self.send_header('Content-type', 'text/html')
+        self._send_html(400, ERROR_HTML_TEMPLATE.format(msg=html.escape(error_message)).encode())
+
+    def _send_html(self, status, body):
+        """Send an HTML body with an explicit Content-Length."""
+        self.send_response(status)
+        self.send_header('Content-type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        
-        error_html = f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 40px auto; text-align: center;">
-                <h1 style="color: #ff4444;">Authorization Failed ❌</h1>
-                <p>An error occurred during the authorization process:</p>
-                <p style="margin-top: 20px; padding: 10px; background-color: #fff0f0; border-radius: 5px; color: #ff4444;">
-                    {error_message}
-                </p>
-                <p>Please close this window and try again.</p>
-            </body>
-        </html>
-        """
-        self.wfile.write(error_html.encode())
+        self.wfile.write(body)
 
 def start_oauth_flow():
     """Start the OAuth flow by opening the authorization URL"""
@@ -206,14 +271,17 @@ def start_oauth_flow():
         
         # Start local server to handle callback
         server_address = ('localhost', 8000)
-        httpd = HTTPServer(server_address, OAuthHandler)
+        httpd = ThreadingHTTPServer(server_address, OAuthHandler)
         
         logger.info("Starting OAuth flow...")
         logger.info("Opening browser for authorization...")
         webbrowser.open(auth_url)
         
         logger.info("Waiting for callback on http://localhost:8000...")
-        httpd.handle_request()  # Handle single request
+        try:
+            httpd.serve_forever()  # Runs until the callback handler shuts it down
+        finally:
+            httpd.server_close()
         
     except Exception as e:
         logger.error(f"Error in OAuth flow: {str(e)}")
@@ -1,137 +1,54 @@
-import os
-import json
-import time
 import logging
-from dotenv import load_dotenv
-import requests
-from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
+from linkedin_api import LinkedInAPI
+from gemini_client import GeminiClient
+from llm_cache import LLMCache
+from logging_setup import configure_logging
 
-# Configure logging
-logging.basicConfig(
-    level=os.getenv('LOG_LEVEL', 'INFO'),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    filename=os.getenv('LOG_FILE', 'linkedin_automation.log')
-)
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
-
-class LinkedInAPI:
-    """LinkedIn API wrapper for handling authentication and API requests."""
-    def __init__(self, access_token):
-        self.access_token = access_token
-        self.base_url = "https://api.linkedin.com/v2"
-        self.headers = {
-            'Authorization': f'Bearer {access_token}',
-            'Content-Type': 'application/json',
-            'X-Restli-Protocol-Version': '2.0.0',
-            'LinkedIn-Version': '202304'
-        }
-
-    def _make_request(self, method, endpoint, data=None):
-        """Make an API request with error handling."""
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        try:
-            response = requests.request(method, url, headers=self.headers, json=data)
-            
-            if response.status_code == 401:
-                raise Exception("Invalid or expired access token")
-            elif response.status_code == 403:
-                raise Exception("Insufficient permissions or rate limit exceeded")
-            elif response.status_code >= 400:
-                raise Exception(f"API request failed: {response.text}")
-                
-            return response
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request failed: {str(e)}")
-            raise
-
-    def get_user_id(self):
-        """Get the current user's LinkedIn ID using OpenID Connect."""
-        try:
-            response = self._make_request('GET', 'userinfo')
-            if response.status_code == 200:
-                profile_data = response.json()
-                user_id = profile_data.get('sub')
-                if not user_id:
-                    raise Exception("Could not find user ID in profile response")
-                return user_id
-            else:
-                raise Exception(f"Failed to get user ID: {response.text}")
-        except Exception as e:
-            logger.error(f"Error getting user ID: {str(e)}")
-            raise
-
-    def submit_share(self, text, title=None, description=None, url=None):
-        """
-        Create a share on LinkedIn.
-        
-        Args:
-            text (str): The main text content of the share
-            title (str, optional): Title for the share when sharing a URL
-            description (str, optional): Description for the share when sharing a URL
-            url (str, optional): URL to be shared
-            
-        Returns:
-            dict: Response containing the share ID
-        """
-        try:
-            # Get the author URN
-            user_id = self.get_user_id()
-            author_urn = f"urn:li:person:{user_id}"
-            
-            # Prepare the share content
-            share_content = {
-                "author": author_urn,
-                "lifecycleState": "PUBLISHED",
-                "specificContent": {
-                    "com.linkedin.ugc.ShareContent": {
-                        "shareCommentary": {
-                            "text": text
-                        },
-                        "shareMediaCategory": "NONE"
-                    }
-                },
-                "visibility": {
-                    "com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"
-                }
-            }
-
-            # If URL is provided, update the share content for article sharing
-            if url:
-                share_content["specificContent"]["com.linkedin.ugc.ShareContent"].update({
-                    "shareMediaCategory": "ARTICLE",
-                    "media": [{
-                        "status": "READY",
-                        "originalUrl": url,
-                        **({"title": {"text": title}} if title else {}),
-                        **({"description": {"text": description}} if description else {})
-                    }]
-                })
-
-            # Log the request body for debugging
-            logger.info(f"Creating share with body: {json.dumps(share_content, indent=2)}")
-
-            # Make the API request
-            response = self._make_request('POST', 'ugcPosts', share_content)
-            
-            if response.status_code in [200, 201]:
-                share_id = response.headers.get('x-restli-id')
-                logger.info(f"Successfully created share with ID: {share_id}")
-                return {"updateKey": share_id}
-            else:
-                raise Exception(f"Failed to create share: {response.text}")
-                
-        except Exception as e:
-            logger.error(f"Error creating share: {str(e)}")
-            raise
+# Fixed instructions sent as Gemini system instructions; only the topic varies per request
+_TOPIC_OPTIONS_INSTRUCTIONS = """You suggest LinkedIn post topics about the tech industry.
+Generate 5 unique and engaging topics. Each topic should:
+- Be specific and focused
+- Include a catchy title
+- Be relevant to full-stack developers
+- Be current and trending
+- Include 1-2 relevant emojis
+
+Format the response as a numbered list with each topic on a new line.
+Example:
+1. 🚀 The Future of Web Development: What's Next?
+2. 💡 5 Game-Changing Tools Every Developer Should Know
+
+Return only the numbered list, no additional text."""
+
+_POST_INSTRUCTIONS = """You write LinkedIn posts from a full-stack developer's perspective.
+The post should:
+- Be under 200 words
+- Start with a hook that grabs attention
+- Include 2-3 relevant emojis
+- Share personal experiences or insights
+- Include practical examples or code snippets
+- End with a thought-provoking question
+- Use plain text only (no markdown or special formatting)
+- Be concise and engaging
+
+Return only the post content with emojis, no additional text."""
+
+# Per-request prompts; the fixed instructions above stay the shared prefix
+_TOPIC_OPTIONS_PROMPT = "Generate 5 LinkedIn post topics about {topic} in the tech industry."
+_POST_PROMPT = "Write a LinkedIn post about this topic: {topic}"
 
 class ContentGenerator:
     """Handles content generation using Gemini API."""
-    def __init__(self, api_key):
-        self.api_key = api_key
-        self.api_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+    __slots__ = ('client', 'topic_client', 'tech_topics')
+
+    def __init__(self, api_key, cache=None):
+        self.client = GeminiClient(api_key)
+        # With a cache (LLM_MEMOIZE), topic option lists for the same base topic
+        # are served from it; posts always go to self.client so each is fresh
+        self.topic_client = GeminiClient(api_key, cache=cache)
         self.tech_topics = [
             "Web Development", "Cloud Computing", "DevOps", "AI/ML", 
             "Cybersecurity", "Blockchain", "Data Science", "Mobile Development",
@@ -139,77 +56,45 @@ class ContentGenerator:
             "API Development", "Microservices", "System Design", "Cloud Native"
         ]
 
-    def _make_request(self, prompt):
-        """Make a request to Gemini API."""
-        headers = {
-            'Content-Type': 'application/json'
-        }
-        
-        data = {
-            "contents": [{
-                "parts": [{"text": prompt}]
-            }]
-        }
-        
-        try:
-            response = requests.post(
-                f"{self.api_url}?key={self.api_key}",
-                headers=headers,
-                json=data
-            )
-            
-            if response.status_code != 200:
-                raise Exception(f"API request failed: {response.text}")
-                
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request failed: {str(e)}")
-            raise
-
     def generate_topic_options(self, base_topic):
         """Generate 5 interesting topic options based on the base topic."""
-        prompt = f"""Generate 5 unique and engaging LinkedIn post topics about {base_topic} in the tech industry.
-        Each topic should:
-        - Be specific and focused
-        - Include a catchy title
-        - Be relevant to full-stack developers
-        - Be current and trending
-        - Include 1-2 relevant emojis
-        
-        Format the response as a numbered list with each topic on a new line.
-        Example:
-        1. 🚀 The Future of Web Development: What's Next?
-        2. 💡 5 Game-Changing Tools Every Developer Should Know
-        
-        Return only the numbered list, no additional text."""
-        
-        response = self._make_request(prompt)
-        topics = response['candidates'][0]['content']['parts'][0]['text'].strip().split('\n')
+        prompt = _TOPIC_OPTIONS_PROMPT.format(topic=base_topic)
+        response = self.topic_client.generate(prompt, system_instruction=_TOPIC_OPTIONS_INSTRUCTIONS)
+        topics = self.client.extract_text(response).split('\n')
         return [topic.strip() for topic in topics if topic.strip()]
 
     def generate_content(self, topic):
         """Generate engaging tech-focused content for the post."""
-        prompt = f"""Write a LinkedIn post about this topic: {topic}
-        The post should:
-        - Be under 200 words
-        - Start with a hook that grabs attention
-        - Include 2-3 relevant emojis
-        - Share personal experiences or insights
-        - Include practical examples or code snippets
-        - End with a thought-provoking question
-        - Be written from a full-stack developer's perspective
-        - Use plain text only (no markdown or special formatting)
-        - Be concise and engaging
-        
-        Return only the post content with emojis, no additional text."""
-        
-        response = self._make_request(prompt)
-        return response['candidates'][0]['content']['parts'][0]['text'].strip()
+        prompt = _POST_PROMPT.format(topic=topic)
+        response = self.client.generate(prompt, system_instruction=_POST_INSTRUCTIONS)
+        return self.client.extract_text(response)
+
+    def prefetch_contents(self, topics):
+        """Start generating a post for every topic in the background.
+
+        Returns one future per topic, so the post for whichever topic the user
+        picks is usually ready by the time they choose. Every request starts at
+        once, so each call costs one Gemini request per topic.
+        """
+        executor = ThreadPoolExecutor(max_workers=max(1, len(topics)))
+        futures = [executor.submit(self.generate_content, topic) for topic in topics]
+        executor.shutdown(wait=False)
+        return futures
 
 def main():
+    # Load .env and open the log file only when the menu actually runs
+    import config
+    configure_logging(
+        level=config.LOG_LEVEL,
+        filename=config.LOG_FILE or 'linkedin_automation.log'
+    )
+
     # Initialize APIs
-    linkedin_client = LinkedInAPI(os.getenv('LINKEDIN_ACCESS_TOKEN'))
-    content_generator = ContentGenerator(os.getenv('GOOGLE_API_KEY'))
+    linkedin_client = LinkedInAPI(config.LINKEDIN_ACCESS_TOKEN)
+    content_generator = ContentGenerator(
+        config.GOOGLE_API_KEY,
+        cache=LLMCache(config.LLM_CACHE_FILE, ttl=config.LLM_CACHE_TTL) if config.LLM_MEMOIZE else None
+    )
 
     while True:
         print("\nLinkedIn Tech Content Creator")
@@ -241,6 +126,9 @@ def main():
                 print("\nGenerating interesting topic options...")
                 topic_options = content_generator.generate_topic_options(base_topic)
                 
+                # Generate a post for each option while the user reads the list
+                prefetched = content_generator.prefetch_contents(topic_options)
+                
                 # Display topic options
                 print("\nGenerated Topic Options:")
                 for i, topic in enumerate(topic_options, 1):
@@ -248,22 +136,25 @@ def main():
                 
                 # Let user select a topic
                 selected_topic = input("\nEnter the number of the topic you want to use (or type your own): ").strip()
+                chosen = None
                 if selected_topic.isdigit() and 1 <= int(selected_topic) <= len(topic_options):
-                    final_topic = topic_options[int(selected_topic) - 1]
-                else:
-                    final_topic = selected_topic
+                    chosen = prefetched[int(selected_topic) - 1]
 
-                # Generate content
-                print("\nGenerating content...")
-                content = content_generator.generate_content(final_topic)
-                print(f"\nGenerated content:\n{content}")
+                # A typed-in topic starts generating now, in the background like the options
+                if chosen is None:
+                    chosen = content_generator.prefetch_contents([selected_topic])[0]
                 
-                # Ask if user wants to include a URL
+                # Ask if user wants to include a URL while the content is generated
                 include_url = input("\nDo you want to include a URL in your post? (y/n): ").lower()
                 url = None
                 if include_url == 'y':
                     url = input("Enter the URL to share: ").strip()
                 
+                # Wait for the content
+                print("\nGenerating content...")
+                content = chosen.result()
+                print(f"\nGenerated content:\n{content}")
+                
                 # Confirm posting
                 confirm = input("\nDo you want to post this content? (y/n): ").lower()
                 if confirm == 'y':
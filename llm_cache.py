@@ -0,0 +1,63 @@
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Cached responses expire after 7 days
+DEFAULT_TTL = 7 * 24 * 60 * 60
+
+# Bump whenever prompt templates change to invalidate every cached response at once
+CACHE_VERSION = "v1"
+
+class LLMCache:
+    """Persistent exact-match cache for Gemini responses backed by SQLite."""
+    def __init__(self, path='cache.db', ttl=DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.stats = {'hits': 0, 'misses': 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model, prompt, system=None):
+        """Build a stable, versioned cache key from the model endpoint, the prompt and any system instruction."""
+        fields = {"model": model, "prompt": prompt}
+        if system is not None:
+            fields["system"] = system
+        payload = json.dumps(fields, sort_keys=True)
+        return f"{CACHE_VERSION}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    def get(self, key):
+        """Return the cached value for a key, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or time.time() - row[1] > self.ttl:
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        """Store a JSON-serializable value under a key."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, separators=(',', ':'), ensure_ascii=False), time.time())
+            )
+            self._conn.commit()
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
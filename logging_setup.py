@@ -0,0 +1,37 @@
+import queue
+import atexit
+import logging
+import logging.handlers
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Log files roll over at LOG_MAX_BYTES, keeping LOG_BACKUP_COUNT old files
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+
+_listener = None
+
+def configure_logging(level, filename):
+    """Send log records through a queue to a background thread that owns the file handler.
+
+    Callers never wait on disk I/O; the thread writes each record to a
+    rotating file as it arrives. Like logging.basicConfig, only the first
+    call configures the root logger.
+    """
+    global _listener
+    root = logging.getLogger()
+    if _listener is not None or root.handlers:
+        return
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        filename, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT
+    )
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, file_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -0,0 +1,82 @@
+import time
+import random
+import logging
+import threading
+import requests
+
+logger = logging.getLogger(__name__)
+
+class RateLimiter:
+    """Thread-safe token bucket allowing max_calls per period seconds.
+
+    At most burst calls (default max_calls) go through back to back; after
+    that calls are spaced period / max_calls seconds apart.
+    """
+    def __init__(self, max_calls, period, burst=None):
+        self.max_calls = max_calls
+        self.period = period
+        self.capacity = float(max_calls if burst is None else burst)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a call is allowed, then consume one token."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                refill = (now - self._updated) * self.max_calls / self.period
+                self._tokens = min(self.capacity, self._tokens + refill)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) * self.period / self.max_calls
+            logger.info(f"Rate limit reached, waiting {wait:.1f} seconds")
+            time.sleep(wait)
+
+# Statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+# Network errors worth retrying. A connect timeout means nothing reached the
+# server, so it is safe for any method; other failures only for GET.
+SAFE_RETRY_ERRORS = (requests.exceptions.ConnectTimeout,)
+GET_RETRY_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+def backoff_delay(attempt, base=0.5, cap=32, retry_after=None):
+    """Seconds to wait before retry number attempt (from 0).
+
+    Uses the server's Retry-After seconds when given, otherwise exponential
+    backoff capped at cap plus up to base seconds of random jitter.
+    """
+    if retry_after is not None and retry_after.isdigit():
+        return float(retry_after)
+    return min(cap, base * 2 ** attempt) + random.uniform(0, base)
+
+def request_with_backoff(session, method, url, max_retries=5, **kwargs):
+    """Send a request, retrying throttled responses with backoff; returns the last response.
+
+    GET requests are also retried on 5xx and network errors. Other methods only
+    retry 429 and connect timeouts, so a post the server may have created
+    before failing is never sent twice. Other 4xx responses are returned at once.
+    """
+    if method == 'GET':
+        retry_statuses, retry_errors = RETRY_STATUSES, GET_RETRY_ERRORS
+    else:
+        retry_statuses, retry_errors = frozenset([429]), SAFE_RETRY_ERRORS
+    for attempt in range(max_retries):
+        try:
+            response = session.request(method, url, **kwargs)
+        except retry_errors as e:
+            if attempt == max_retries - 1:
+                raise
+            delay = backoff_delay(attempt)
+            logger.warning(f"{method} {url.split('?')[0]} failed ({type(e).__name__}), retrying in {delay:.1f} seconds")
+            time.sleep(delay)
+            continue
+        if response.status_code not in retry_statuses or attempt == max_retries - 1:
+            return response
+        retry_after = response.headers.get('Retry-After') if response.status_code == 429 else None
+        delay = backoff_delay(attempt, retry_after=retry_after)
+        logger.warning(f"{method} {url.split('?')[0]} returned {response.status_code}, retrying in {delay:.1f} seconds")
+        time.sleep(delay)